@@ -15,6 +15,7 @@ HTTP-ready for production scaling).
 import json
 import logging
 import time
+from functools import cached_property
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -243,10 +244,13 @@ class NarrativeAgent:
         try:
             from src.components.rag_engine import RAGEngine
             from src.components.llm_orchestrator import LLMOrchestrator
-            from src.models.case_input import CaseInput
+            from src.components.data_parser import DataParser
 
             payload = task.payload
-            case = CaseInput(**payload["case"])
+            # The case was validated (and anonymized) by DataEnrichmentAgent
+            case = DataParser(anonymize=False).parse_case_input(
+                payload["case"], validated=True,
+            )
             stats = payload["stats"]
             patterns = payload["patterns"]
             typology = payload["typology"]
@@ -371,12 +375,26 @@ class CoordinatorAgent:
     AGENT_NAME = "coordinator_agent"
 
     def __init__(self):
-        self.data_agent = DataEnrichmentAgent()
-        self.typology_agent = TypologyAgent()
-        self.narrative_agent = NarrativeAgent()
-        self.audit_agent = AuditAgent()
         self.pipeline_log = []
 
+    # Sub-agents are built on first use and then reused across execute()
+    # calls; a run that fails early never constructs the later agents.
+    @cached_property
+    def data_agent(self) -> DataEnrichmentAgent:
+        return DataEnrichmentAgent()
+
+    @cached_property
+    def typology_agent(self) -> TypologyAgent:
+        return TypologyAgent()
+
+    @cached_property
+    def narrative_agent(self) -> NarrativeAgent:
+        return NarrativeAgent()
+
+    @cached_property
+    def audit_agent(self) -> AuditAgent:
+        return AuditAgent()
+
     def agent_card(self) -> Dict:
         return {
             "name": self.AGENT_NAME,
@@ -11,11 +11,12 @@ the MCP tool server pattern. Any LLM client that supports MCP can call
 these tools directly.
 """
 
-import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 
+from src.utils import json_utils
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,7 +48,7 @@ class MCPToolResult:
 
     def to_dict(self) -> Dict:
         return {
-            "content": [{"type": "text", "text": json.dumps(self.content, default=str)}],
+            "content": [{"type": "text", "text": json_utils.dumps(self.content, default=str)}],
             "isError": self.is_error,
         }
 
@@ -70,6 +71,7 @@ class TransactionAnalyzerServer:
         from src.components.data_parser import DataParser
         self.parser = DataParser(anonymize=False)
         self._tools = self._register_tools()
+        self._handlers = self._register_handlers()
         logger.info("MCP Server '%s' initialized with %d tools",
                      self.SERVER_NAME, len(self._tools))
 
@@ -124,24 +126,32 @@ class TransactionAnalyzerServer:
         """List all available tools on this MCP server."""
         return [tool.to_dict() for tool in self._tools.values()]
 
+    def _register_handlers(self) -> Dict[str, Callable[[Dict], MCPToolResult]]:
+        """Map each tool name to a callable taking the raw arguments dict."""
+        return {
+            "analyze_transactions": lambda args: self._analyze_transactions(
+                args.get("case_json", {}),
+            ),
+            "calculate_baseline": lambda args: self._calculate_baseline(
+                args.get("case_json", {}),
+            ),
+            "classify_typology": lambda args: self._classify_typology(
+                args.get("patterns", []),
+                args.get("alert_reason", ""),
+            ),
+        }
+
     def call_tool(self, name: str, arguments: Dict) -> MCPToolResult:
         """Call a tool by name with given arguments."""
-        if name not in self._tools:
+        handler = self._handlers.get(name)
+        if handler is None:
             return MCPToolResult(
                 {"error": f"Unknown tool: {name}"},
                 is_error=True,
             )
 
         try:
-            if name == "analyze_transactions":
-                return self._analyze_transactions(arguments.get("case_json", {}))
-            elif name == "calculate_baseline":
-                return self._calculate_baseline(arguments.get("case_json", {}))
-            elif name == "classify_typology":
-                return self._classify_typology(
-                    arguments.get("patterns", []),
-                    arguments.get("alert_reason", ""),
-                )
+            return handler(arguments)
         except Exception as e:
             logger.error("MCP tool '%s' failed: %s", name, e)
             return MCPToolResult({"error": str(e)}, is_error=True)
@@ -205,6 +215,7 @@ class SARTemplateServer:
 
     def __init__(self):
         self._tools = self._register_tools()
+        self._handlers = self._register_handlers()
         logger.info("MCP Server '%s' initialized with %d tools",
                      self.SERVER_NAME, len(self._tools))
 
@@ -257,20 +268,27 @@ class SARTemplateServer:
     def list_tools(self) -> List[Dict]:
         return [tool.to_dict() for tool in self._tools.values()]
 
+    def _register_handlers(self) -> Dict[str, Callable[[Dict], MCPToolResult]]:
+        return {
+            "retrieve_templates": lambda args: self._retrieve_templates(
+                args.get("query", ""),
+                args.get("top_k", 2),
+            ),
+            "generate_narrative": lambda args: self._generate_narrative(
+                args.get("case_json", {}),
+            ),
+            "get_regulatory_context": lambda args: self._get_regulatory_context(
+                args.get("typology", ""),
+            ),
+        }
+
     def call_tool(self, name: str, arguments: Dict) -> MCPToolResult:
-        if name not in self._tools:
+        handler = self._handlers.get(name)
+        if handler is None:
             return MCPToolResult({"error": f"Unknown tool: {name}"}, is_error=True)
 
         try:
-            if name == "retrieve_templates":
-                return self._retrieve_templates(
-                    arguments.get("query", ""),
-                    arguments.get("top_k", 2),
-                )
-            elif name == "generate_narrative":
-                return self._generate_narrative(arguments.get("case_json", {}))
-            elif name == "get_regulatory_context":
-                return self._get_regulatory_context(arguments.get("typology", ""))
+            return handler(arguments)
         except Exception as e:
             logger.error("MCP tool '%s' failed: %s", name, e)
             return MCPToolResult({"error": str(e)}, is_error=True)
@@ -358,6 +376,7 @@ class AuditTrailServer:
         from src.components.audit_logger import AuditLogger
         self.audit = AuditLogger()
         self._tools = self._register_tools()
+        self._handlers = self._register_handlers()
         logger.info("MCP Server '%s' initialized with %d tools",
                      self.SERVER_NAME, len(self._tools))
 
@@ -399,25 +418,30 @@ class AuditTrailServer:
     def list_tools(self) -> List[Dict]:
         return [tool.to_dict() for tool in self._tools.values()]
 
+    def _register_handlers(self) -> Dict[str, Callable[[Dict], MCPToolResult]]:
+        return {
+            "log_decision": lambda args: self._log_decision(
+                args.get("case_id", ""),
+                args.get("step", ""),
+                args.get("data_points", {}),
+                args.get("reasoning", ""),
+            ),
+            "get_audit_trail": lambda args: self._get_audit_trail(
+                args.get("case_id", ""),
+            ),
+            "export_audit": lambda args: self._export_audit(
+                args.get("case_id", ""),
+                args.get("format", "json"),
+            ),
+        }
+
     def call_tool(self, name: str, arguments: Dict) -> MCPToolResult:
-        if name not in self._tools:
+        handler = self._handlers.get(name)
+        if handler is None:
             return MCPToolResult({"error": f"Unknown tool: {name}"}, is_error=True)
 
         try:
-            if name == "log_decision":
-                return self._log_decision(
-                    arguments.get("case_id", ""),
-                    arguments.get("step", ""),
-                    arguments.get("data_points", {}),
-                    arguments.get("reasoning", ""),
-                )
-            elif name == "get_audit_trail":
-                return self._get_audit_trail(arguments.get("case_id", ""))
-            elif name == "export_audit":
-                return self._export_audit(
-                    arguments.get("case_id", ""),
-                    arguments.get("format", "json"),
-                )
+            return handler(arguments)
         except Exception as e:
             logger.error("MCP tool '%s' failed: %s", name, e)
             return MCPToolResult({"error": str(e)}, is_error=True)
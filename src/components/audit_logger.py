@@ -1,7 +1,9 @@
-import json
+import csv
+import io
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
+from src.utils import json_utils
 from src.utils.db_utils import DatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -60,18 +62,16 @@ class AuditLogger:
 
     def export_audit_trail(self, case_id: str, fmt: str = "json") -> str:
         trail = self.get_audit_trail(case_id)
-        if fmt == "json":
-            return json.dumps(trail, indent=2, default=str)
-        elif fmt == "csv":
+        if fmt == "csv":
             if not trail:
                 return "No audit trail found"
             headers = list(trail[0].keys())
-            lines = [",".join(headers)]
-            for event in trail:
-                values = [str(event.get(h, "")).replace(",", ";") for h in headers]
-                lines.append(",".join(values))
-            return "\n".join(lines)
-        return json.dumps(trail, indent=2, default=str)
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            writer.writerow(headers)
+            writer.writerows([event.get(h, "") for h in headers] for event in trail)
+            return buf.getvalue()
+        return json_utils.dumps(trail, default=str, pretty=True)
 
     def close(self):
         self.db.close()
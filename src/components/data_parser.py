@@ -3,11 +3,33 @@ from typing import List, Dict
 from datetime import datetime
 from collections import Counter
 
-from src.models.case_input import CaseInput, Transaction
+from src.models.case_input import CaseInput, CustomerInfo, Transaction
 from src.utils.anonymization import anonymize_case
 
 logger = logging.getLogger(__name__)
 
+_HIGH_RISK_TYPES = frozenset(("SWIFT", "Wire Transfer", "Hawala"))
+
+
+def _parse_date(value: str):
+    """Parse a YYYY-MM-DD or DD-MM-YYYY date; None if it is neither."""
+    # fromisoformat is C-implemented and much cheaper than strptime for
+    # the canonical zero-padded form, which nearly all inputs use. It also
+    # accepts other ISO forms (e.g. week dates like 2025-W01-1), so only
+    # strict NNNN-NN-NN strings take this path.
+    if (len(value) == 10 and value[4] == "-" and value[7] == "-"
+            and value.isascii() and (value[:4] + value[5:7] + value[8:]).isdigit()):
+        try:
+            return datetime.fromisoformat(value).date()
+        except ValueError:
+            pass
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    return None
+
 
 class DataParser:
     """Parses and validates case input, calculates transaction stats,
@@ -16,9 +38,23 @@ class DataParser:
     def __init__(self, anonymize: bool = True):
         self.anonymize = anonymize
 
-    def parse_case_input(self, raw_json: dict) -> CaseInput:
-        """Parse raw JSON into a validated CaseInput model."""
-        case = CaseInput(**raw_json)
+    def parse_case_input(self, raw_json: dict, validated: bool = False) -> CaseInput:
+        """Parse raw JSON into a validated CaseInput model.
+
+        Pass validated=True only for data that has already been through
+        CaseInput validation (e.g. a model_dump() handed between agents);
+        the models are then built with model_construct, skipping validators.
+        """
+        if validated:
+            case = CaseInput.model_construct(**{
+                **raw_json,
+                "customer": CustomerInfo.model_construct(**raw_json["customer"]),
+                "transactions": [
+                    Transaction.model_construct(**t) for t in raw_json["transactions"]
+                ],
+            })
+        else:
+            case = CaseInput(**raw_json)
         logger.info(
             "Parsed case %s with %d transactions",
             case.case_id, len(case.transactions)
@@ -53,40 +89,49 @@ class DataParser:
                 "unique_beneficiaries": 0,
             }
 
-        amounts = [t.amount for t in transactions]
-        credits = [t for t in transactions if t.amount > 0]
-        debits = [t for t in transactions if t.amount < 0]
-
+        # One pass over the transactions instead of a list/generator per stat
+        abs_amounts = []
+        total_credits = 0.0
+        total_debits = 0.0
+        credit_count = 0
+        debit_count = 0
         dates = []
         for t in transactions:
-            try:
-                dates.append(datetime.strptime(t.date, "%Y-%m-%d"))
-            except ValueError:
-                try:
-                    dates.append(datetime.strptime(t.date, "%d-%m-%Y"))
-                except ValueError:
-                    pass
-
-        date_range_start = min(dates).strftime("%Y-%m-%d") if dates else "N/A"
-        date_range_end = max(dates).strftime("%Y-%m-%d") if dates else "N/A"
-        date_range_days = (max(dates) - min(dates)).days + 1 if len(dates) > 1 else 1
+            amount = t.amount
+            abs_amounts.append(abs(amount))
+            if amount > 0:
+                total_credits += amount
+                credit_count += 1
+            elif amount < 0:
+                total_debits += -amount
+                debit_count += 1
+            parsed = _parse_date(t.date)
+            if parsed is not None:
+                dates.append(parsed)
+
+        if dates:
+            first, last = min(dates), max(dates)
+            date_range_start = first.strftime("%Y-%m-%d")
+            date_range_end = last.strftime("%Y-%m-%d")
+        else:
+            date_range_start = date_range_end = "N/A"
+        date_range_days = (last - first).days + 1 if len(dates) > 1 else 1
 
         txn_types = Counter(t.type for t in transactions)
         currency = transactions[0].currency if transactions else "INR"
 
-        abs_amounts = [abs(a) for a in amounts]
         total_volume = sum(abs_amounts)
 
         stats = {
             "total_transactions": len(transactions),
             "total_volume": total_volume,
-            "total_credits": sum(t.amount for t in credits),
-            "total_debits": sum(abs(t.amount) for t in debits),
-            "credit_count": len(credits),
-            "debit_count": len(debits),
-            "avg_amount": total_volume / len(amounts) if len(amounts) > 0 else 0.0,
-            "max_amount": max(abs_amounts) if abs_amounts else 0.0,
-            "min_amount": min(abs_amounts) if abs_amounts else 0.0,
+            "total_credits": total_credits,
+            "total_debits": total_debits,
+            "credit_count": credit_count,
+            "debit_count": debit_count,
+            "avg_amount": total_volume / len(abs_amounts),
+            "max_amount": max(abs_amounts),
+            "min_amount": min(abs_amounts),
             "date_range_start": date_range_start,
             "date_range_end": date_range_end,
             "date_range_days": date_range_days,
@@ -110,15 +155,41 @@ class DataParser:
         if not case.transactions:
             return patterns
 
-        # Pattern 1: Structuring (amounts below reporting threshold)
+        # Scan the transactions once for every per-transaction rule; the
+        # patterns below are then emitted in their usual order.
         threshold = 1000000  # 10 lakh INR
-        near_threshold = [
-            t for t in case.transactions
-            if 0 < t.amount < threshold and t.amount > threshold * 0.8
-        ]
-        if len(near_threshold) >= 3:
+        near_threshold = 0
+        small_deposits = 0
+        round_txns = 0
+        large_txns = []
+        hr_types = []
+        dates_amounts = {}
+        for t in case.transactions:
+            amount = t.amount
+            if amount > 0:
+                if threshold * 0.8 < amount < threshold:
+                    near_threshold += 1
+                if amount < 200000:
+                    small_deposits += 1
+                if amount % 10000 == 0:
+                    round_txns += 1
+            if abs(amount) >= 5000000:  # 50 lakhs
+                large_txns.append(t)
+            if t.type in _HIGH_RISK_TYPES:
+                hr_types.append(t.type)
+
+            day = dates_amounts.get(t.date)
+            if day is None:
+                day = dates_amounts[t.date] = [0.0, 0.0]
+            if amount > 0:
+                day[0] += amount
+            else:
+                day[1] += abs(amount)
+
+        # Pattern 1: Structuring (amounts below reporting threshold)
+        if near_threshold >= 3:
             patterns.append(
-                f"Structuring: {len(near_threshold)} transactions just below "
+                f"Structuring: {near_threshold} transactions just below "
                 f"INR {threshold:,.0f} reporting threshold"
             )
 
@@ -132,26 +203,16 @@ class DataParser:
                 )
 
         # Pattern 3: Rapid movement (same-day credits and debits)
-        dates_amounts = {}
-        for t in case.transactions:
-            if t.date not in dates_amounts:
-                dates_amounts[t.date] = {"credits": 0.0, "debits": 0.0}
-            if t.amount > 0:
-                dates_amounts[t.date]["credits"] += t.amount
-            else:
-                dates_amounts[t.date]["debits"] += abs(t.amount)
-
-        for date, vals in dates_amounts.items():
-            if vals["credits"] > 0 and vals["debits"] > 0:
+        for date, (credits, debits) in dates_amounts.items():
+            if credits > 0 and debits > 0:
                 patterns.append(
                     f"Rapid movement: Credits and debits on same day ({date})"
                 )
 
         # Pattern 4: Multiple small deposits
-        small_deposits = [t for t in case.transactions if 0 < t.amount < 200000]
-        if len(small_deposits) >= 5:
+        if small_deposits >= 5:
             patterns.append(
-                f"Multiple small deposits: {len(small_deposits)} deposits under INR 2,00,000"
+                f"Multiple small deposits: {small_deposits} deposits under INR 2,00,000"
             )
 
         # Pattern 5: Income mismatch
@@ -173,30 +234,23 @@ class DataParser:
             )
 
         # Pattern 7: Round-number transactions
-        round_txns = [
-            t for t in case.transactions
-            if t.amount > 0 and t.amount % 10000 == 0
-        ]
-        if len(round_txns) >= 3:
+        if round_txns >= 3:
             patterns.append(
-                f"Round-number transactions: {len(round_txns)} transactions "
+                f"Round-number transactions: {round_txns} transactions "
                 f"in exact round amounts"
             )
 
         # Pattern 8: Large single transaction
-        for t in case.transactions:
-            if abs(t.amount) >= 5000000:  # 50 lakhs
-                patterns.append(
-                    f"Large transaction: {t.currency} {abs(t.amount):,.2f} on {t.date}"
-                )
+        for t in large_txns:
+            patterns.append(
+                f"Large transaction: {t.currency} {abs(t.amount):,.2f} on {t.date}"
+            )
 
         # Pattern 9: High-risk transaction types
-        high_risk_types = ["SWIFT", "Wire Transfer", "Hawala"]
-        hr_txns = [t for t in case.transactions if t.type in high_risk_types]
-        if hr_txns:
-            types_found = ", ".join(set(t.type for t in hr_txns))
+        if hr_types:
+            types_found = ", ".join(set(hr_types))
             patterns.append(
-                f"High-risk transfer types: {len(hr_txns)} {types_found} transactions"
+                f"High-risk transfer types: {len(hr_types)} {types_found} transactions"
             )
 
         logger.info("Identified %d suspicious patterns", len(patterns))
@@ -3,7 +3,7 @@ import time
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from src.config import CONFIG
 from src.models.case_input import CaseInput
@@ -89,8 +89,13 @@ class LLMOrchestrator:
         risk_score: int,
         regulatory_context: str,
         template_reference: str,
+        token_callback: Optional[Callable[[str], None]] = None,
     ) -> Tuple[SARNarrative, LLMCallback]:
-        """Generate a SAR narrative using the LLM."""
+        """Generate a SAR narrative using the LLM.
+
+        If token_callback is given, the response is streamed and the callback
+        is invoked with each text chunk as it arrives.
+        """
 
         callback = LLMCallback()
         callback.model_used = self.model
@@ -106,7 +111,7 @@ class LLMOrchestrator:
         narrative_text = ""
         try:
             callback.start_time = time.time()
-            narrative_text = self._call_ollama(prompt)
+            narrative_text = self._call_ollama(prompt, token_callback)
             callback.end_time = time.time()
             callback.response_received = narrative_text
             duration = callback.end_time - callback.start_time
@@ -137,7 +142,7 @@ class LLMOrchestrator:
 
         return narrative, callback
 
-    def _call_ollama(self, prompt: str) -> str:
+    def _call_ollama(self, prompt: str, token_callback=None) -> str:
         """Call Ollama API for text generation."""
         try:
             from langchain_ollama import OllamaLLM
@@ -150,8 +155,14 @@ class LLMOrchestrator:
             )
 
             full_prompt = f"{self.system_prompt}\n\n{prompt}"
-            response = llm.invoke(full_prompt)
-            return response
+            if token_callback is None:
+                return llm.invoke(full_prompt)
+
+            chunks = []
+            for chunk in llm.stream(full_prompt):
+                chunks.append(chunk)
+                token_callback(chunk)
+            return "".join(chunks)
 
         except ImportError:
             logger.warning("langchain_ollama not available. Trying direct ollama.")
@@ -168,8 +179,17 @@ class LLMOrchestrator:
                         "temperature": self.temperature,
                         "num_predict": self.max_tokens,
                     },
+                    stream=token_callback is not None,
                 )
-                return response["message"]["content"]
+                if token_callback is None:
+                    return response["message"]["content"]
+
+                chunks = []
+                for part in response:
+                    chunk = part["message"]["content"]
+                    chunks.append(chunk)
+                    token_callback(chunk)
+                return "".join(chunks)
             except Exception as e:
                 raise RuntimeError(f"All LLM backends failed: {e}")
 
@@ -1,5 +1,6 @@
 import json
 import logging
+import re
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
@@ -11,6 +12,24 @@ from src.models.case_input import CaseInput
 
 logger = logging.getLogger(__name__)
 
+# Keywords that boost confidence when the retrieved typology's own terms
+# appear in the alert reason or detected patterns.
+_TYPOLOGY_KEYWORDS = {
+    "structuring": ["structuring", "threshold", "smurfing", "below reporting"],
+    "layering": ["layering", "multiple accounts", "rapid transfer", "cross-border"],
+    "wire_fraud": ["wire", "swift", "remittance", "foreign"],
+    "cash_business": ["cash", "retail", "business volume"],
+    "identity_theft": ["identity", "kyc", "synthetic", "document"],
+    "rapid_movement": ["rapid", "same day", "immediate transfer"],
+    "round_tripping": ["round-trip", "foreign investment", "circular"]
+}
+
+# One case-insensitive alternation per typology, compiled at import.
+_TYPOLOGY_PATTERNS = {
+    typology: re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+    for typology, keywords in _TYPOLOGY_KEYWORDS.items()
+}
+
 
 class RAGEngine:
     """Retrieval-Augmented Generation engine using ChromaDB for template and regulatory retrieval."""
@@ -30,43 +49,50 @@ class RAGEngine:
         )
 
         # Load templates and regulatory data
-        self._load_templates()
-        self._load_regulatory_data()
+        existing_ids = self._existing_ids()
+        self._load_templates(existing_ids)
+        self._load_regulatory_data(existing_ids)
 
         logger.info(f"RAG Engine initialized. Collection '{collection_name}' has {self.collection.count()} documents.")
 
-    def _load_templates(self):
+    def _existing_ids(self) -> set:
+        """IDs already stored in the collection (ids only, no documents)."""
+        try:
+            result = self.collection.get(include=[])
+            return set(result["ids"]) if result["ids"] else set()
+        except Exception:
+            return set()
+
+    def _add_documents(self, ids: List[str], documents: List[str], metadatas: List[Dict]):
+        """Add new documents in a single call so they are embedded as one batch."""
+        if ids:
+            self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+
+    def _load_templates(self, existing_ids: set):
         """Load SAR templates into ChromaDB."""
         template_dir = Path(__file__).parent.parent.parent / "data" / "templates"
         if not template_dir.exists():
             logger.warning(f"Template directory not found: {template_dir}")
             return
 
-        existing_ids = set()
-        try:
-            result = self.collection.get()
-            existing_ids = set(result["ids"]) if result["ids"] else set()
-        except Exception:
-            pass
-
+        ids, documents, metadatas = [], [], []
         for template_file in template_dir.glob("*.txt"):
             doc_id = f"template_{template_file.stem}"
             if doc_id in existing_ids:
                 continue
 
-            content = template_file.read_text(encoding="utf-8")
-            self.collection.add(
-                documents=[content],
-                metadatas=[{
-                    "type": "template",
-                    "typology": template_file.stem.replace("_template", ""),
-                    "source": str(template_file.name)
-                }],
-                ids=[doc_id]
-            )
+            ids.append(doc_id)
+            documents.append(template_file.read_text(encoding="utf-8"))
+            metadatas.append({
+                "type": "template",
+                "typology": template_file.stem.replace("_template", ""),
+                "source": str(template_file.name)
+            })
             logger.info(f"Loaded template: {template_file.name}")
 
-    def _load_regulatory_data(self):
+        self._add_documents(ids, documents, metadatas)
+
+    def _load_regulatory_data(self, existing_ids: set):
         """Load typology descriptions into ChromaDB."""
         reg_dir = Path(__file__).parent.parent.parent / "data" / "regulatory"
         typology_file = reg_dir / "typology_descriptions.json"
@@ -75,33 +101,26 @@ class RAGEngine:
             logger.warning(f"Typology file not found: {typology_file}")
             return
 
-        existing_ids = set()
-        try:
-            result = self.collection.get()
-            existing_ids = set(result["ids"]) if result["ids"] else set()
-        except Exception:
-            pass
-
         with open(typology_file, "r", encoding="utf-8") as f:
             typologies = json.load(f)
 
+        ids, documents, metadatas = [], [], []
         for key, data in typologies.items():
             doc_id = f"typology_{key}"
             if doc_id in existing_ids:
                 continue
 
-            content = f"{data['name']}\n{data['description']}\nIndicators: {', '.join(data['indicators'])}\n{data['pmla_reference']}\n{data['rbi_reference']}"
-            self.collection.add(
-                documents=[content],
-                metadatas=[{
-                    "type": "typology",
-                    "typology": key,
-                    "name": data["name"]
-                }],
-                ids=[doc_id]
-            )
+            ids.append(doc_id)
+            documents.append(f"{data['name']}\n{data['description']}\nIndicators: {', '.join(data['indicators'])}\n{data['pmla_reference']}\n{data['rbi_reference']}")
+            metadatas.append({
+                "type": "typology",
+                "typology": key,
+                "name": data["name"]
+            })
             logger.info(f"Loaded typology: {key}")
 
+        self._add_documents(ids, documents, metadatas)
+
     def retrieve_templates(self, query: str, top_k: int = 2) -> List[Dict]:
         """Retrieve most relevant SAR templates for a given case summary."""
         results = self.collection.query(
@@ -138,22 +157,11 @@ class RAGEngine:
             distance = results["distances"][0][0] if results["distances"] else 1.0
             confidence = max(0, min(100, (1 - distance) * 100))
 
-            # Boost confidence for keyword matches
-            keyword_map = {
-                "structuring": ["structuring", "threshold", "smurfing", "below reporting"],
-                "layering": ["layering", "multiple accounts", "rapid transfer", "cross-border"],
-                "wire_fraud": ["wire", "swift", "remittance", "foreign"],
-                "cash_business": ["cash", "retail", "business volume"],
-                "identity_theft": ["identity", "kyc", "synthetic", "document"],
-                "rapid_movement": ["rapid", "same day", "immediate transfer"],
-                "round_tripping": ["round-trip", "foreign investment", "circular"]
-            }
-
-            combined_text = (alert_reason + " " + " ".join(patterns)).lower()
-            for typo, keywords in keyword_map.items():
-                if any(kw in combined_text for kw in keywords):
-                    if typo == typology:
-                        confidence = min(100, confidence + 15)
+            # Boost confidence when the typology's keywords appear
+            pattern = _TYPOLOGY_PATTERNS.get(typology)
+            combined_text = alert_reason + " " + " ".join(patterns)
+            if pattern is not None and pattern.search(combined_text):
+                confidence = min(100, confidence + 15)
 
             logger.info(f"Typology identified: {typology} (confidence: {confidence:.1f}%)")
             return typology, confidence
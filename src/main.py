@@ -41,7 +41,7 @@ class SARGenerator:
 
     def generate(
         self, case_json: dict, user_id: str = "system",
-        progress_callback=None,
+        progress_callback=None, token_callback=None,
     ) -> Tuple[SARNarrative, ExplainabilityOutput]:
         """Full pipeline: Parse > Analyze > RAG > LLM > Audit > Output.
 
@@ -49,6 +49,8 @@ class SARGenerator:
             case_json: Raw case JSON data.
             user_id: ID of the user initiating generation.
             progress_callback: Optional callable(step, message) for UI updates.
+            token_callback: Optional callable(text) receiving narrative
+                chunks as the LLM streams them.
         """
 
         def _progress(step: int, message: str):
@@ -135,6 +137,7 @@ class SARGenerator:
             risk_score=risk_score,
             regulatory_context=regulatory_context,
             template_reference=template_text,
+            token_callback=token_callback,
         )
 
         audit_data = llm_callback.get_audit_data()
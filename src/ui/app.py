@@ -6,17 +6,16 @@ Features:
 - Live pattern detection visualization
 - Confidence score breakdown chart
 - Regulatory compliance checker
-- Multi-format export (PDF, JSON, CSV, TXT)
+- Multi-format export (PDF, JSON, Parquet, CSV, TXT)
 - Real-time stats sidebar
 - Multi-agent pipeline toggle
 """
 
 import json
 import sys
-import time
 import logging
-from pathlib import Path
 from datetime import datetime
+from pathlib import Path
 
 import streamlit as st
 
@@ -25,9 +24,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.config import CONFIG
-from src.main import SARGenerator
 from src.utils.auth import AuthManager
-from src.utils.pdf_generator import generate_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +41,7 @@ st.set_page_config(
 # ------------------------------------------------------------------
 # CSS Styles
 # ------------------------------------------------------------------
-st.markdown("""
+st.html("""
 <style>
     /* Root variables */
     :root {
@@ -278,13 +275,16 @@ st.markdown("""
         background: rgba(255,255,255,0.03);
     }
 </style>
-""", unsafe_allow_html=True)
+""")
 
 
 # ------------------------------------------------------------------
 # Session state init
 # ------------------------------------------------------------------
 def init_session():
+    if st.session_state.get("_initialized"):
+        return
+
     defaults = {
         "authenticated": False,
         "user_token": None,
@@ -297,9 +297,8 @@ def init_session():
         "total_patterns": 0,
         "pipeline_mode": "direct",
     }
-    for key, val in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = val
+    st.session_state.update(defaults)
+    st.session_state._initialized = True
 
 
 init_session()
@@ -310,14 +309,14 @@ init_session()
 # ------------------------------------------------------------------
 def login_page():
     """Render the login page."""
-    st.markdown("""
+    st.html("""
     <div style="text-align:center; margin-top:60px;">
         <h1 style="color:#e0e0e0; font-size:2.2rem;">AuditWatch</h1>
         <p style="color:#9e9e9e; font-size:1rem; margin-bottom:40px;">
             SAR Narrative Generator -- Secure Access
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
@@ -343,14 +342,14 @@ def login_page():
                     st.error("Invalid credentials. Please try again.")
 
         st.markdown("---")
-        st.markdown("""
+        st.html("""
         <div style="text-align:center; color:#9e9e9e; font-size:0.8rem;">
             <p>Default accounts for demo:</p>
             <p><strong>admin</strong> / auditwatch2026</p>
             <p><strong>analyst_01</strong> / analyst123</p>
             <p><strong>reviewer_01</strong> / reviewer123</p>
         </div>
-        """, unsafe_allow_html=True)
+        """)
 
 
 def logout():
@@ -363,6 +362,36 @@ def logout():
 # ------------------------------------------------------------------
 # Helper functions
 # ------------------------------------------------------------------
+def _sar_generator_cls():
+    """Import SARGenerator on demand (pulls in the RAG/LLM stack)."""
+    from src.main import SARGenerator
+    return SARGenerator
+
+
+@st.cache_resource(show_spinner=False)
+def get_generator():
+    """Return the shared SAR generator pipeline instance."""
+    return _sar_generator_cls()()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_trail(case_id):
+    """Fetch the audit trail for a case."""
+    return get_generator().get_audit_trail(case_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _export_audit(case_id, fmt):
+    """Export the audit trail for a case in the given format."""
+    return get_generator().export_audit(case_id, fmt=fmt)
+
+
+def _invalidate_audit_cache():
+    """Drop cached audit data after new events are logged."""
+    _get_trail.clear()
+    _export_audit.clear()
+
+
 def get_sample_cases():
     """Load sample case files."""
     cases_dir = project_root / "data" / "sample_cases"
@@ -376,29 +405,19 @@ def get_sample_cases():
 
 def render_metric_card(label, value, col):
     """Render a styled metric card."""
-    col.markdown(f"""
+    col.html(f"""
     <div class="metric-card">
         <h4>{label}</h4>
         <div class="metric-value">{value}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
 
-def render_risk_badge(score):
-    """Return HTML badge for risk score."""
-    if score >= 70:
-        return f'<span class="badge badge-danger">HIGH RISK ({score}/100)</span>'
-    elif score >= 40:
-        return f'<span class="badge badge-warning">MEDIUM RISK ({score}/100)</span>'
-    else:
-        return f'<span class="badge badge-success">LOW RISK ({score}/100)</span>'
-
+_BADGE_TMPL_HIGH = '<span class="badge badge-danger">HIGH RISK ({s}/100)</span>'
+_BADGE_TMPL_MED = '<span class="badge badge-warning">MEDIUM RISK ({s}/100)</span>'
+_BADGE_TMPL_LOW = '<span class="badge badge-success">LOW RISK ({s}/100)</span>'
 
-def render_score_bar(label, value, max_val=100):
-    """Render a horizontal score bar."""
-    pct = min(100, int((value / max_val) * 100)) if max_val > 0 else 0
-    css_class = "high" if pct >= 70 else "medium" if pct >= 40 else "low"
-    return f"""
+_SCORE_BAR_TMPL = """
     <div style="margin: 6px 0;">
         <div style="display:flex; justify-content:space-between; font-size:0.8rem; color:#9e9e9e;">
             <span>{label}</span><span>{value}/{max_val}</span>
@@ -409,60 +428,90 @@ def render_score_bar(label, value, max_val=100):
     </div>
     """
 
-
-def render_compliance_check(label, passed):
-    """Render a regulatory compliance checklist item."""
-    icon = "[PASS]" if passed else "[FAIL]"
-    css_class = "compliance-pass" if passed else "compliance-fail"
-    return f"""
+_COMPLIANCE_TMPL = """
     <div class="compliance-item">
         <span class="{css_class}" style="font-weight:700;">{icon}</span>
         <span style="color:#e0e0e0;">{label}</span>
     </div>
     """
 
+_COMPLIANCE_STATE = {
+    True: ("[PASS]", "compliance-pass"),
+    False: ("[FAIL]", "compliance-fail"),
+}
+
+
+def render_risk_badge(score):
+    """Return HTML badge for risk score."""
+    if score >= 70:
+        tmpl = _BADGE_TMPL_HIGH
+    elif score >= 40:
+        tmpl = _BADGE_TMPL_MED
+    else:
+        tmpl = _BADGE_TMPL_LOW
+    return tmpl.format(s=score)
+
+
+def render_score_bar(label, value, max_val=100):
+    """Render a horizontal score bar."""
+    pct = min(100, int((value / max_val) * 100)) if max_val > 0 else 0
+    css_class = "high" if pct >= 70 else "medium" if pct >= 40 else "low"
+    return _SCORE_BAR_TMPL.format(
+        label=label, value=value, max_val=max_val, css_class=css_class, pct=pct,
+    )
+
+
+def render_compliance_check(label, passed):
+    """Render a regulatory compliance checklist item."""
+    icon, css_class = _COMPLIANCE_STATE[bool(passed)]
+    return _COMPLIANCE_TMPL.format(css_class=css_class, icon=icon, label=label)
+
 
 # ------------------------------------------------------------------
 # Sidebar
 # ------------------------------------------------------------------
+@st.fragment
 def render_sidebar():
-    """Render the sidebar with user info and stats."""
-    user = st.session_state.user_info
-    with st.sidebar:
-        st.markdown(f"""
-        <div style="padding:16px; background:#131328; border-radius:12px; margin-bottom:16px;">
-            <div style="color:#e0e0e0; font-weight:600;">{user.get('name', 'User')}</div>
-            <div style="color:#9e9e9e; font-size:0.8rem;">{user.get('role', 'analyst').upper()}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    """Render the sidebar with user info and stats.
 
-        st.markdown("---")
-        st.markdown("**Session Stats**")
-        st.metric("Cases Processed", st.session_state.cases_processed)
-        st.metric("Patterns Detected", st.session_state.total_patterns)
+    Runs as a fragment so toggling the pipeline mode only reruns the sidebar.
+    Must be called inside a ``with st.sidebar`` block.
+    """
+    user = st.session_state.user_info
+    st.html(f"""
+    <div style="padding:16px; background:#131328; border-radius:12px; margin-bottom:16px;">
+        <div style="color:#e0e0e0; font-weight:600;">{user.get('name', 'User')}</div>
+        <div style="color:#9e9e9e; font-size:0.8rem;">{user.get('role', 'analyst').upper()}</div>
+    </div>
+    """)
 
-        st.markdown("---")
-        st.markdown("**Pipeline Mode**")
-        mode = st.radio(
-            "Select pipeline",
-            ["Direct Pipeline", "Multi-Agent (A2A)"],
-            index=0 if st.session_state.pipeline_mode == "direct" else 1,
-            label_visibility="collapsed",
-        )
-        st.session_state.pipeline_mode = "direct" if mode == "Direct Pipeline" else "agents"
+    st.markdown("---")
+    st.markdown("**Session Stats**")
+    st.metric("Cases Processed", st.session_state.cases_processed)
+    st.metric("Patterns Detected", st.session_state.total_patterns)
 
-        if st.session_state.pipeline_mode == "agents":
-            st.markdown("""
-            <div style="background:rgba(2,136,209,0.1); border:1px solid #0288d1;
-                        border-radius:8px; padding:10px; font-size:0.8rem; color:#29b6f6;">
-                Multi-Agent mode uses 5 coordinated A2A agents:
-                Coordinator, DataEnrichment, Typology, Narrative, Audit
-            </div>
-            """, unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown("**Pipeline Mode**")
+    mode = st.radio(
+        "Select pipeline",
+        ["Direct Pipeline", "Multi-Agent (A2A)"],
+        index=0 if st.session_state.pipeline_mode == "direct" else 1,
+        label_visibility="collapsed",
+    )
+    st.session_state.pipeline_mode = "direct" if mode == "Direct Pipeline" else "agents"
+
+    if st.session_state.pipeline_mode == "agents":
+        st.html("""
+        <div style="background:rgba(2,136,209,0.1); border:1px solid #0288d1;
+                    border-radius:8px; padding:10px; font-size:0.8rem; color:#29b6f6;">
+            Multi-Agent mode uses 5 coordinated A2A agents:
+            Coordinator, DataEnrichment, Typology, Narrative, Audit
+        </div>
+        """)
 
-        st.markdown("---")
-        if st.button("Sign Out", use_container_width=True):
-            logout()
+    st.markdown("---")
+    if st.button("Sign Out", use_container_width=True):
+        logout()
 
 
 # ------------------------------------------------------------------
@@ -470,12 +519,12 @@ def render_sidebar():
 # ------------------------------------------------------------------
 def page_input():
     """Case input and generation page."""
-    st.markdown("""
+    st.html("""
     <div class="header-banner">
         <h1>SAR Narrative Generator</h1>
         <p>AI-powered Suspicious Activity Report generation with full audit trail</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     sample_cases = get_sample_cases()
 
@@ -496,7 +545,7 @@ def page_input():
                 list(sample_cases.keys()),
             )
             case_json = sample_cases[selected]
-            st.markdown(f"""
+            st.html(f"""
             <div class="metric-card">
                 <h4>Selected Case</h4>
                 <div style="color:#e0e0e0;">
@@ -505,7 +554,7 @@ def page_input():
                     <strong>Transactions:</strong> {len(case_json.get('transactions', []))}
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+            """)
         else:
             case_json = None
 
@@ -551,40 +600,47 @@ def _run_generation(case_json):
         step_placeholders = []
         for i, step_name in enumerate(pipeline_steps):
             ph = st.empty()
-            ph.markdown(f"""
+            ph.html(f"""
             <div class="pipeline-step">
                 <div class="step-number">{i + 1}</div>
                 <span style="color:#9e9e9e;">{step_name}</span>
             </div>
-            """, unsafe_allow_html=True)
+            """)
             step_placeholders.append(ph)
 
     # Pattern detection container
     pattern_container = st.empty()
+    narrative_placeholder = st.empty()
     result_container = st.container()
     completed_steps = []
+    streamed_tokens = []
 
     def progress_callback(step, message):
         """Update pipeline visualization in real-time."""
         for j in range(len(pipeline_steps)):
             if j + 1 < step:
-                step_placeholders[j].markdown(f"""
+                step_placeholders[j].html(f"""
                 <div class="pipeline-step completed">
                     <div class="step-number completed">{j + 1}</div>
                     <span style="color:#66bb6a;">{pipeline_steps[j]} -- Done</span>
                 </div>
-                """, unsafe_allow_html=True)
+                """)
             elif j + 1 == step:
-                step_placeholders[j].markdown(f"""
+                step_placeholders[j].html(f"""
                 <div class="pipeline-step active">
                     <div class="step-number active">{j + 1}</div>
                     <span style="color:#29b6f6;">{message}</span>
                 </div>
-                """, unsafe_allow_html=True)
+                """)
         completed_steps.append(step)
 
+    def token_callback(chunk):
+        """Show the narrative as the LLM streams it."""
+        streamed_tokens.append(chunk)
+        narrative_placeholder.markdown("".join(streamed_tokens))
+
     try:
-        generator = SARGenerator()
+        generator = get_generator()
 
         if st.session_state.pipeline_mode == "agents":
             # Multi-agent pipeline
@@ -620,23 +676,27 @@ def _run_generation(case_json):
 
                     st.session_state.narrative = narrative
                     st.session_state.explainability = explainability
+                    _invalidate_audit_cache()
                     st.session_state.cases_processed += 1
                     st.session_state.total_patterns += len(data_result.get("patterns", []))
 
                     # Show agent execution summary
                     st.markdown("#### Agent Execution Summary")
+                    step_rows = []
                     for agent_step in result.get("agent_steps", []):
                         agent_name = agent_step.get("agent", "unknown")
                         duration = agent_step.get("duration_seconds", 0)
                         status_val = agent_step.get("status", "unknown")
                         badge_class = "badge-success" if status_val == "completed" else "badge-danger"
-                        st.markdown(f"""
+                        step_rows.append(f"""
                         <div class="pipeline-step completed">
                             <span style="color:#e0e0e0; flex:1;">{agent_name}</span>
                             <span class="badge {badge_class}">{status_val}</span>
                             <span style="color:#9e9e9e; font-size:0.8rem;">{duration:.3f}s</span>
                         </div>
-                        """, unsafe_allow_html=True)
+                        """)
+                    if step_rows:
+                        st.html("".join(step_rows))
 
                     st.success("Narrative generated successfully. Switch to the Review tab.")
                 else:
@@ -649,19 +709,22 @@ def _run_generation(case_json):
                 case_json,
                 user_id=st.session_state.user_info.get("user_id", "system"),
                 progress_callback=progress_callback,
+                token_callback=token_callback,
             )
+            narrative_placeholder.empty()
 
             # Mark all steps complete
             for j in range(len(pipeline_steps)):
-                step_placeholders[j].markdown(f"""
+                step_placeholders[j].html(f"""
                 <div class="pipeline-step completed">
                     <div class="step-number completed">{j + 1}</div>
                     <span style="color:#66bb6a;">{pipeline_steps[j]} -- Done</span>
                 </div>
-                """, unsafe_allow_html=True)
+                """)
 
             st.session_state.narrative = narrative
             st.session_state.explainability = explainability
+            _invalidate_audit_cache()
             st.session_state.cases_processed += 1
             st.session_state.total_patterns += len(narrative.red_flags)
 
@@ -669,11 +732,14 @@ def _run_generation(case_json):
             if narrative.red_flags:
                 with result_container:
                     st.markdown("#### Patterns Detected in Real-Time")
-                    for pattern in narrative.red_flags:
-                        st.markdown(
-                            f'<div class="pattern-item">{pattern}</div>',
-                            unsafe_allow_html=True,
+                    st.html(
+                        "<div class='pattern-list'>"
+                        + "".join(
+                            f'<div class="pattern-item">{pattern}</div>'
+                            for pattern in narrative.red_flags
                         )
+                        + "</div>"
+                    )
 
             st.success("Narrative generated successfully. Switch to the Review tab.")
 
@@ -685,14 +751,15 @@ def _run_generation(case_json):
 # ------------------------------------------------------------------
 # Page 2: Narrative Review
 # ------------------------------------------------------------------
+@st.fragment
 def page_narrative():
     """Review and edit the generated narrative."""
-    st.markdown("""
+    st.html("""
     <div class="header-banner">
         <h1>Narrative Review</h1>
         <p>Review, edit, and approve the generated SAR narrative</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     narrative = st.session_state.narrative
     explainability = st.session_state.explainability
@@ -711,7 +778,7 @@ def page_narrative():
     st.markdown("---")
 
     # Risk score badge
-    st.markdown(render_risk_badge(narrative.confidence_score), unsafe_allow_html=True)
+    st.html(render_risk_badge(narrative.confidence_score))
 
     # Confidence score breakdown
     st.markdown("#### Risk Score Breakdown")
@@ -733,13 +800,14 @@ def page_narrative():
     with col_a:
         if st.button("Approve Narrative", use_container_width=True, type="primary"):
             try:
-                generator = SARGenerator()
+                generator = get_generator()
                 edits = edited_text if edited_text != narrative.narrative_text else None
                 generator.approve_narrative(
                     narrative.case_id,
                     st.session_state.user_info.get("user_id", "system"),
                     edited_text=edits,
                 )
+                _invalidate_audit_cache()
                 st.success("Narrative approved and logged to audit trail.")
             except Exception as e:
                 st.error("Approval error: %s" % str(e))
@@ -749,12 +817,13 @@ def page_narrative():
             reason = st.text_input("Rejection reason:", key="reject_reason")
             if reason:
                 try:
-                    generator = SARGenerator()
+                    generator = get_generator()
                     generator.reject_narrative(
                         narrative.case_id,
                         st.session_state.user_info.get("user_id", "system"),
                         reason=reason,
                     )
+                    _invalidate_audit_cache()
                     st.warning("Narrative rejected.")
                 except Exception as e:
                     st.error("Rejection error: %s" % str(e))
@@ -781,23 +850,33 @@ def _render_confidence_breakdown(narrative, explainability):
     volume_score = min(remaining, 25)
     counterparty_score = max(0, remaining - volume_score)
 
-    components_html = ""
-    components_html += render_score_bar("Pattern Detection", pattern_score, 40)
-    components_html += render_score_bar("Volume Deviation", volume_score, 25)
-    components_html += render_score_bar("KYC Risk Rating", kyc_score, 15)
-    components_html += render_score_bar("Counterparty Risk", counterparty_score, 10)
-    components_html += "<div style='margin-top:12px;'>"
-    components_html += render_score_bar("TOTAL RISK SCORE", risk, 100)
-    components_html += "</div>"
+    components_html = "".join([
+        render_score_bar("Pattern Detection", pattern_score, 40),
+        render_score_bar("Volume Deviation", volume_score, 25),
+        render_score_bar("KYC Risk Rating", kyc_score, 15),
+        render_score_bar("Counterparty Risk", counterparty_score, 10),
+        "<div style='margin-top:12px;'>",
+        render_score_bar("TOTAL RISK SCORE", risk, 100),
+        "</div>",
+    ])
 
-    st.markdown(components_html, unsafe_allow_html=True)
+    st.html(components_html)
 
 
-def _render_compliance_checker(narrative, explainability):
-    """Render the regulatory compliance checklist."""
-    text = narrative.narrative_text.lower() if narrative.narrative_text else ""
+_YEAR_STRS = tuple(str(y) for y in range(2020, 2030))
 
-    checks = [
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _run_compliance(narrative_text, red_flags, typology):
+    """Evaluate the regulatory compliance checks for a narrative.
+
+    Cached on the narrative text, red flags and typology, so reruns of the
+    review page skip the checks unless the narrative itself changed.
+    Returns a list of (label, passed) tuples.
+    """
+    text = narrative_text.lower()
+
+    return [
         ("PMLA Section 12 reference included",
          "pmla" in text and "section 12" in text),
         ("Customer identification details present",
@@ -805,11 +884,11 @@ def _render_compliance_checker(narrative, explainability):
         ("Suspicious activity description provided",
          "suspicious" in text or "suspicion" in text),
         ("Transaction period specified",
-         any(str(y) in text for y in range(2020, 2030))),
+         any(y in text for y in _YEAR_STRS)),
         ("Red flag indicators documented",
-         len(narrative.red_flags) > 0),
+         len(red_flags) > 0),
         ("Typology classification included",
-         bool(narrative.typology and narrative.typology != "unknown")),
+         bool(typology and typology != "unknown")),
         ("FIU-IND filing recommendation present",
          "fiu" in text or "filing" in text),
         ("RBI Master Direction compliance",
@@ -818,35 +897,46 @@ def _render_compliance_checker(narrative, explainability):
          "conclusion" in text or "recommendation" in text),
     ]
 
+
+def _render_compliance_checker(narrative, explainability):
+    """Render the regulatory compliance checklist."""
+    checks = _run_compliance(
+        narrative.narrative_text or "",
+        tuple(narrative.red_flags),
+        narrative.typology or "",
+    )
+
     passed = sum(1 for _, v in checks if v)
     total = len(checks)
 
-    st.markdown(f"""
+    st.html(f"""
     <div style="margin-bottom:12px;">
         <span style="color:#e0e0e0; font-weight:600;">Compliance Score: {passed}/{total}</span>
         <span class="badge {'badge-success' if passed >= 7 else 'badge-warning' if passed >= 5 else 'badge-danger'}">
             {'COMPLIANT' if passed >= 7 else 'PARTIAL' if passed >= 5 else 'NON-COMPLIANT'}
         </span>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
-    html = ""
-    for label, passed_check in checks:
-        html += render_compliance_check(label, passed_check)
-    st.markdown(html, unsafe_allow_html=True)
+    st.html(
+        "".join(render_compliance_check(label, ok) for label, ok in checks),
+    )
 
 
 # ------------------------------------------------------------------
 # Page 3: Audit Trail
 # ------------------------------------------------------------------
+_AUDIT_DETAIL_FIELDS = ("metadata", "input_data", "retrieved_context", "llm_reasoning")
+
+
 def page_audit():
     """Display the audit trail for the current case."""
-    st.markdown("""
+    st.html("""
     <div class="header-banner">
         <h1>Audit Trail</h1>
         <p>Complete regulatory traceability for every decision point</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     narrative = st.session_state.narrative
     if not narrative:
@@ -854,8 +944,7 @@ def page_audit():
         return
 
     try:
-        generator = SARGenerator()
-        trail = generator.get_audit_trail(narrative.case_id)
+        trail = _get_trail(narrative.case_id)
 
         if not trail:
             st.info("No audit events found for case %s." % narrative.case_id)
@@ -863,33 +952,30 @@ def page_audit():
 
         st.markdown(f"**{len(trail)} audit events** for case **{narrative.case_id}**")
 
-        for i, event in enumerate(trail):
-            event_type = event.get("event_type", "unknown")
-            timestamp = event.get("timestamp", "")
-            user_id = event.get("user_id", "system")
-
-            with st.expander(
-                "%d. %s  |  %s  |  %s" % (i + 1, event_type.upper(), timestamp, user_id)
-            ):
-                # Show metadata
-                metadata = event.get("metadata")
-                if metadata:
-                    if isinstance(metadata, str):
-                        try:
-                            metadata = json.loads(metadata)
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                    st.json(metadata)
-
-                # Show other fields
-                for field in ["input_data", "retrieved_context", "llm_reasoning"]:
-                    value = event.get(field)
-                    if value:
-                        st.markdown(f"**{field.replace('_', ' ').title()}:**")
-                        if isinstance(value, (dict, list)):
-                            st.json(value)
-                        else:
-                            st.text(str(value)[:1000])
+        # Only the selected event is rendered
+        selected = st.selectbox(
+            "Event",
+            range(len(trail)),
+            format_func=lambda i: "%d. %s  |  %s  |  %s" % (
+                i + 1,
+                trail[i].get("event_type", "unknown").upper(),
+                trail[i].get("timestamp", ""),
+                trail[i].get("user_id", "system"),
+            ),
+        )
+        event = trail[selected]
+
+        with st.container(border=True):
+            # One JSON tree for the whole event instead of a widget per field
+            details = {}
+            for field in _AUDIT_DETAIL_FIELDS:
+                value = event.get(field)
+                if value:
+                    if isinstance(value, str) and len(value) > 1000:
+                        value = value[:1000] + "..."
+                    details[field] = value
+            if details:
+                st.json(details)
 
     except Exception as e:
         st.error("Error loading audit trail: %s" % str(e))
@@ -900,12 +986,12 @@ def page_audit():
 # ------------------------------------------------------------------
 def page_export():
     """Multi-format export page."""
-    st.markdown("""
+    st.html("""
     <div class="header-banner">
         <h1>Export Reports</h1>
         <p>Export SAR narratives and audit trails in multiple formats</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     narrative = st.session_state.narrative
     if not narrative:
@@ -914,125 +1000,191 @@ def page_export():
 
     st.markdown("#### Export Narrative")
 
+    # Artifacts are built by callables that Streamlit only invokes when the
+    # corresponding download button is clicked. A builder that raises fails
+    # the download; Streamlit logs it and reports the error to the browser
+    # instead of serving a partial or placeholder file.
+    case_id = narrative.case_id
     col1, col2 = st.columns(2)
 
     with col1:
         # PDF export
         st.markdown("**PDF Report**")
-        try:
-            pdf_data = generate_pdf(narrative, narrative.case_id)
-            st.download_button(
-                "Download PDF",
-                data=pdf_data,
-                file_name="SAR_%s.pdf" % narrative.case_id,
-                mime="application/pdf",
-                use_container_width=True,
-            )
-        except Exception as e:
-            st.error("PDF generation failed: %s" % str(e))
+        st.download_button(
+            "Download PDF",
+            data=lambda: _build_pdf(narrative),
+            file_name="SAR_%s.pdf" % case_id,
+            mime="application/pdf",
+            use_container_width=True,
+        )
 
         # JSON export
         st.markdown("**JSON Export**")
-        json_data = json.dumps(narrative.model_dump(), indent=2, default=str)
         st.download_button(
             "Download JSON",
-            data=json_data,
-            file_name="SAR_%s.json" % narrative.case_id,
+            data=lambda: narrative.model_dump_json(indent=2),
+            file_name="SAR_%s.json" % case_id,
             mime="application/json",
             use_container_width=True,
         )
 
+        # Parquet export (pyarrow ships with Streamlit)
+        st.markdown("**Parquet Export**")
+        st.download_button(
+            "Download Parquet",
+            data=lambda: _build_parquet(narrative),
+            file_name="SAR_%s.parquet" % case_id,
+            mime="application/octet-stream",
+            use_container_width=True,
+        )
+
     with col2:
         # TXT export
         st.markdown("**Plain Text**")
-        txt_data = "SUSPICIOUS TRANSACTION REPORT\n"
-        txt_data += "Case ID: %s\n" % narrative.case_id
-        txt_data += "Generated: %s\n" % datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        txt_data += "=" * 60 + "\n\n"
-        txt_data += narrative.narrative_text
         st.download_button(
             "Download TXT",
-            data=txt_data,
-            file_name="SAR_%s.txt" % narrative.case_id,
+            data=lambda: _build_txt(narrative),
+            file_name="SAR_%s.txt" % case_id,
             mime="text/plain",
             use_container_width=True,
         )
 
         # CSV export (audit trail)
         st.markdown("**Audit Trail CSV**")
-        try:
-            generator = SARGenerator()
-            csv_data = generator.export_audit(narrative.case_id, fmt="csv")
-            st.download_button(
-                "Download Audit CSV",
-                data=csv_data,
-                file_name="audit_%s.csv" % narrative.case_id,
-                mime="text/csv",
-                use_container_width=True,
-            )
-        except Exception as e:
-            st.error("CSV export failed: %s" % str(e))
+        st.download_button(
+            "Download Audit CSV",
+            data=lambda: _export_audit(case_id, "csv"),
+            file_name="audit_%s.csv" % case_id,
+            mime="text/csv",
+            use_container_width=True,
+        )
 
     # Audit JSON export
     st.markdown("---")
     st.markdown("#### Export Audit Trail")
-    try:
-        generator = SARGenerator()
-        audit_json = generator.export_audit(narrative.case_id, fmt="json")
-        st.download_button(
-            "Download Audit Trail JSON",
-            data=audit_json,
-            file_name="audit_%s.json" % narrative.case_id,
-            mime="application/json",
-            use_container_width=True,
-        )
-    except Exception as e:
-        st.error("Audit export failed: %s" % str(e))
+    st.download_button(
+        "Download Audit Trail JSON",
+        data=lambda: _export_audit(case_id, "json"),
+        file_name="audit_%s.json" % case_id,
+        mime="application/json",
+        use_container_width=True,
+    )
+
+
+def _build_pdf(narrative):
+    """Render the narrative as a PDF report."""
+    from src.utils.pdf_generator import generate_pdf
+    return generate_pdf(narrative, narrative.case_id)
+
+
+def _build_parquet(narrative):
+    """Render the narrative as a single-row, zstd-compressed Parquet file."""
+    import io
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from src.utils import json_utils
+
+    # Explicit schema: inferred structs break on empty dicts, and
+    # transaction_stats is free-form so it is stored as a JSON string.
+    schema = pa.schema([
+        ("case_id", pa.string()),
+        ("generated_at", pa.timestamp("us")),
+        ("narrative_text", pa.string()),
+        ("sections", pa.map_(pa.string(), pa.string())),
+        ("confidence_score", pa.float64()),
+        ("typology", pa.string()),
+        ("red_flags", pa.list_(pa.string())),
+        ("templates_used", pa.list_(pa.string())),
+        ("model_version", pa.string()),
+        ("transaction_stats", pa.string()),
+    ])
+    row = narrative.model_dump(mode="python")
+    row["sections"] = list(row["sections"].items())
+    row["transaction_stats"] = json_utils.dumps(row["transaction_stats"], default=str)
+
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pylist([row], schema=schema), buf, compression="zstd")
+    return buf.getvalue()
+
+
+def _build_txt(narrative):
+    """Render the narrative as a plain-text report."""
+    txt_data = "SUSPICIOUS TRANSACTION REPORT\n"
+    txt_data += "Case ID: %s\n" % narrative.case_id
+    txt_data += "Generated: %s\n" % datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    txt_data += "=" * 60 + "\n\n"
+    txt_data += narrative.narrative_text
+    return txt_data
 
 
 # ------------------------------------------------------------------
 # Page 5: Architecture
 # ------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def _mcp_servers():
+    """Return the MCP tool servers shown on the architecture page."""
+    from src.agents.mcp_servers import (
+        TransactionAnalyzerServer,
+        SARTemplateServer,
+        AuditTrailServer,
+    )
+
+    return [
+        ("Transaction Analyzer", TransactionAnalyzerServer()),
+        ("SAR Template Engine", SARTemplateServer()),
+        ("Audit Trail Manager", AuditTrailServer()),
+    ]
+
+
+@st.cache_resource(show_spinner=False)
+def _a2a_agent_cards():
+    """Return the agent cards of the A2A agents."""
+    from src.agents.a2a_agents import (
+        CoordinatorAgent,
+        DataEnrichmentAgent,
+        TypologyAgent,
+        NarrativeAgent,
+        AuditAgent,
+    )
+
+    agents = [
+        CoordinatorAgent(),
+        DataEnrichmentAgent(),
+        TypologyAgent(),
+        NarrativeAgent(),
+        AuditAgent(),
+    ]
+    return [agent.agent_card() for agent in agents]
+
+
 def page_architecture():
     """Show the MCP/A2A architecture."""
-    st.markdown("""
+    st.html("""
     <div class="header-banner">
         <h1>System Architecture</h1>
         <p>MCP Tool Servers and A2A Multi-Agent Architecture</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     # MCP Servers
     st.markdown("#### MCP Tool Servers")
     st.markdown("Real, callable MCP tool servers wrapping pipeline components:")
 
     try:
-        from src.agents.mcp_servers import (
-            TransactionAnalyzerServer,
-            SARTemplateServer,
-            AuditTrailServer,
-        )
-
-        servers = [
-            ("Transaction Analyzer", TransactionAnalyzerServer),
-            ("SAR Template Engine", SARTemplateServer),
-            ("Audit Trail Manager", AuditTrailServer),
-        ]
-
-        for name, ServerClass in servers:
-            server = ServerClass()
+        for name, server in _mcp_servers():
             tools = server.list_tools()
             with st.expander("%s -- %d tools" % (name, len(tools))):
-                for tool in tools:
-                    st.markdown(f"""
-                    <div class="pipeline-step">
-                        <div class="step-number">{tool['name'][:1].upper()}</div>
-                        <div>
-                            <strong style="color:#e0e0e0;">{tool['name']}</strong><br>
-                            <span style="color:#9e9e9e; font-size:0.85rem;">{tool['description']}</span>
+                # One element per server instead of one per tool
+                if tools:
+                    st.html("".join(f"""
+                        <div class="pipeline-step">
+                            <div class="step-number">{tool['name'][:1].upper()}</div>
+                            <div>
+                                <strong style="color:#e0e0e0;">{tool['name']}</strong><br>
+                                <span style="color:#9e9e9e; font-size:0.85rem;">{tool['description']}</span>
+                            </div>
                         </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """ for tool in tools))
     except Exception as e:
         st.error("Error loading MCP servers: %s" % str(e))
 
@@ -1043,35 +1195,18 @@ def page_architecture():
     st.markdown("Specialized agents orchestrated by the CoordinatorAgent:")
 
     try:
-        from src.agents.a2a_agents import (
-            CoordinatorAgent,
-            DataEnrichmentAgent,
-            TypologyAgent,
-            NarrativeAgent,
-            AuditAgent,
-        )
-
-        agents = [
-            CoordinatorAgent(),
-            DataEnrichmentAgent(),
-            TypologyAgent(),
-            NarrativeAgent(),
-            AuditAgent(),
-        ]
-
-        for agent in agents:
-            card = agent.agent_card()
+        for card in _a2a_agent_cards():
             skills = card.get("skills", [])
             with st.expander("%s -- %d skills" % (card["name"], len(skills))):
-                st.markdown(
+                st.html(
                     '<span class="badge badge-info">v%s</span>' % card.get("version", "1.0"),
-                    unsafe_allow_html=True,
                 )
                 st.markdown("_%s_" % card["description"])
-                for skill in skills:
-                    st.markdown(
+                if skills:
+                    st.markdown("\n".join(
                         "- **%s**: %s" % (skill["name"], skill["description"])
-                    )
+                        for skill in skills
+                    ))
     except Exception as e:
         st.error("Error loading A2A agents: %s" % str(e))
 
@@ -1081,12 +1216,12 @@ def page_architecture():
 # ------------------------------------------------------------------
 def page_settings():
     """Settings page (admin only)."""
-    st.markdown("""
+    st.html("""
     <div class="header-banner">
         <h1>Settings</h1>
         <p>System configuration and administration</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
     user = st.session_state.user_info
     if user.get("role") != "admin":
@@ -1123,7 +1258,8 @@ def main():
         login_page()
         return
 
-    render_sidebar()
+    with st.sidebar:
+        render_sidebar()
 
     # Navigation
     pages = {
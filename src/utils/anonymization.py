@@ -1,46 +1,37 @@
 import re
 import hashlib
-from src.models.case_input import CaseInput, CustomerInfo, Transaction
+from functools import lru_cache
+from itertools import repeat
+from src.models.case_input import CaseInput
 from typing import List
 
 
+@lru_cache(maxsize=8192)
 def anonymize_value(value: str, prefix: str = "ANON") -> str:
-    h = hashlib.md5(value.encode()).hexdigest()[:6].upper()
+    h = hashlib.blake2b(value.encode(), digest_size=3).hexdigest().upper()
     return f"[{prefix}-{h}]"
 
 
 def anonymize_case(case: CaseInput) -> CaseInput:
-    anon_customer = CustomerInfo(
-        name=anonymize_value(case.customer.name, "NAME"),
-        account_number=anonymize_value(case.customer.account_number, "ACCT"),
-        kyc_risk_rating=case.customer.kyc_risk_rating,
-        occupation=case.customer.occupation,
-        account_open_date=case.customer.account_open_date,
-        expected_monthly_volume=case.customer.expected_monthly_volume,
-        declared_income=case.customer.declared_income,
-        address=anonymize_value(case.customer.address, "ADDR") if case.customer.address else "",
-        pan_number=anonymize_value(case.customer.pan_number, "PAN") if case.customer.pan_number else ""
-    )
+    # The input is an already-validated CaseInput, so copy it and swap in
+    # the hashed fields rather than re-running the validators on every field.
+    customer = case.customer
+    anon_customer = customer.model_copy(update={
+        "name": anonymize_value(customer.name, "NAME"),
+        "account_number": anonymize_value(customer.account_number, "ACCT"),
+        "address": anonymize_value(customer.address, "ADDR") if customer.address else "",
+        "pan_number": anonymize_value(customer.pan_number, "PAN") if customer.pan_number else "",
+    })
 
-    anon_transactions = []
-    for txn in case.transactions:
-        anon_txn = Transaction(
-            date=txn.date,
-            amount=txn.amount,
-            currency=txn.currency,
-            type=txn.type,
-            originator=anonymize_value(txn.originator, "ORIG"),
-            beneficiary=anonymize_value(txn.beneficiary, "BENF"),
-            description=txn.description
-        )
-        anon_transactions.append(anon_txn)
+    txns = case.transactions
+    orig_h = list(map(anonymize_value, [t.originator for t in txns], repeat("ORIG")))
+    benf_h = list(map(anonymize_value, [t.beneficiary for t in txns], repeat("BENF")))
+    anon_transactions = [
+        t.model_copy(update={"originator": o, "beneficiary": b})
+        for t, o, b in zip(txns, orig_h, benf_h)
+    ]
 
-    return CaseInput(
-        case_id=case.case_id,
-        customer=anon_customer,
-        transactions=anon_transactions,
-        alert_reason=case.alert_reason,
-        investigation_notes=case.investigation_notes,
-        alert_date=case.alert_date,
-        assigned_analyst=case.assigned_analyst
-    )
+    return case.model_copy(update={
+        "customer": anon_customer,
+        "transactions": anon_transactions,
+    })
@@ -1,12 +1,16 @@
 import hashlib
 import hmac
-import json
 import time
 import base64
 import logging
 import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Optional, Dict
 
+from src.utils import json_utils
+
 logger = logging.getLogger(__name__)
 
 # Roles hierarchy: admin > reviewer > analyst
@@ -60,6 +64,78 @@ def _b64_decode(data: str) -> bytes:
     return base64.urlsafe_b64decode(data.encode("utf-8"))
 
 
+# Every token carries the same header, so its encoded segment is fixed.
+_HEADER_B64 = _b64_encode(json_utils.dumps_bytes({"alg": "HS256", "typ": "JWT"}))
+
+
+@lru_cache(maxsize=8)
+def _hmac_prototype(key: bytes) -> "hmac.HMAC":
+    """HMAC-SHA256 state with the key already absorbed; copy() before use."""
+    return hmac.new(key, digestmod=hashlib.sha256)
+
+
+def _sign(signing_input: str, key: bytes) -> bytes:
+    """HS256 signature of a JWT signing input."""
+    mac = _hmac_prototype(key).copy()
+    mac.update(signing_input.encode("utf-8"))
+    return mac.digest()
+
+
+# Verified payloads keyed on (secret, token), most recently used last.
+# Streamlit verifies the same token on every rerun, and any tampering
+# changes the key. Invalid tokens are cached as None.
+_VERIFY_CACHE_SIZE = 1024
+_verify_cache: "OrderedDict[tuple, Optional[Dict]]" = OrderedDict()
+_verify_lock = threading.Lock()
+
+
+def _verify_signed(token: str, secret: str) -> Optional[Dict]:
+    """Return the decoded payload of a correctly signed token, else None."""
+    key = (secret, token)
+    with _verify_lock:
+        if key in _verify_cache:
+            _verify_cache.move_to_end(key)
+            return _verify_cache[key]
+
+    payload = _check_signature(token, secret)
+    with _verify_lock:
+        _verify_cache[key] = payload
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    return payload
+
+
+def _forget_token(token: str, secret: str):
+    """Drop a token from the verification cache (e.g. once it has expired)."""
+    with _verify_lock:
+        _verify_cache.pop((secret, token), None)
+
+
+def _check_signature(token: str, secret: str) -> Optional[Dict]:
+    """Check a token's HS256 signature and return its decoded payload."""
+    try:
+        parts = token.split(".")
+        if len(parts) != 3:
+            return None
+
+        header_b64, payload_b64, signature_b64 = parts
+
+        # Verify signature
+        expected_sig = _sign(f"{header_b64}.{payload_b64}", secret.encode("utf-8"))
+        actual_sig = _b64_decode(signature_b64)
+
+        if not hmac.compare_digest(expected_sig, actual_sig):
+            logger.warning("Token verification failed: invalid signature")
+            return None
+
+        # Decode payload
+        return json_utils.loads(_b64_decode(payload_b64))
+
+    except Exception as e:
+        logger.error("Token verification error: %s", e)
+        return None
+
+
 class AuthManager:
     """JWT-based authentication with role-based access control.
 
@@ -69,6 +145,7 @@ class AuthManager:
 
     def __init__(self):
         self.secret = _get_jwt_secret()
+        self._key = self.secret.encode("utf-8")
         self.token_expiry_hours = 24
         self._init_users()
 
@@ -90,7 +167,7 @@ class AuthManager:
             return None
 
         password_hash = _hash_password(password)
-        if password_hash != user["password_hash"]:
+        if not hmac.compare_digest(password_hash, user["password_hash"]):
             logger.warning("Authentication failed: invalid password for '%s'", username)
             return None
 
@@ -100,7 +177,6 @@ class AuthManager:
 
     def create_token(self, user_id: str, role: str) -> str:
         """Create a JWT token (HS256, stdlib only)."""
-        header = {"alg": "HS256", "typ": "JWT"}
         payload = {
             "sub": user_id,
             "role": role,
@@ -108,55 +184,28 @@ class AuthManager:
             "exp": int(time.time()) + (self.token_expiry_hours * 3600),
         }
 
-        header_b64 = _b64_encode(json.dumps(header).encode("utf-8"))
-        payload_b64 = _b64_encode(json.dumps(payload).encode("utf-8"))
+        payload_b64 = _b64_encode(json_utils.dumps_bytes(payload))
 
-        signing_input = f"{header_b64}.{payload_b64}"
-        signature = hmac.new(
-            self.secret.encode("utf-8"),
-            signing_input.encode("utf-8"),
-            hashlib.sha256,
-        ).digest()
-        signature_b64 = _b64_encode(signature)
+        signing_input = f"{_HEADER_B64}.{payload_b64}"
+        signature_b64 = _b64_encode(_sign(signing_input, self._key))
 
-        return f"{header_b64}.{payload_b64}.{signature_b64}"
+        return f"{signing_input}.{signature_b64}"
 
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify a JWT token and return claims if valid."""
-        try:
-            parts = token.split(".")
-            if len(parts) != 3:
-                return None
-
-            header_b64, payload_b64, signature_b64 = parts
-
-            # Verify signature
-            signing_input = f"{header_b64}.{payload_b64}"
-            expected_sig = hmac.new(
-                self.secret.encode("utf-8"),
-                signing_input.encode("utf-8"),
-                hashlib.sha256,
-            ).digest()
-            actual_sig = _b64_decode(signature_b64)
-
-            if not hmac.compare_digest(expected_sig, actual_sig):
-                logger.warning("Token verification failed: invalid signature")
-                return None
-
-            # Decode payload
-            payload = json.loads(_b64_decode(payload_b64).decode("utf-8"))
-
-            # Check expiry
-            if payload.get("exp", 0) < time.time():
-                logger.warning("Token expired for user '%s'", payload.get("sub"))
-                return None
-
-            return payload
-
-        except Exception as e:
-            logger.error("Token verification error: %s", e)
+        payload = _verify_signed(token, self.secret)
+        if payload is None:
             return None
 
+        # Check expiry; expired tokens never become valid again, so evict them
+        if payload.get("exp", 0) < time.time():
+            logger.warning("Token expired for user '%s'", payload.get("sub"))
+            _forget_token(token, self.secret)
+            return None
+
+        # Copy so callers cannot mutate the cached claims
+        return dict(payload)
+
     def check_role(self, token: str, required_role: str) -> bool:
         """Check if token has the required role or higher."""
         claims = self.verify_token(token)
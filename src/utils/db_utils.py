@@ -1,35 +1,145 @@
 import sqlite3
 import json
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 from src.config import CONFIG
+from src.utils import json_utils
 
 logger = logging.getLogger(__name__)
 
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # Safe under WAL: commits no longer fsync, checkpoints still do
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA cache_size=-65536",    # 64MB
+    "PRAGMA temp_store=MEMORY",
+)
+
+_SQL_INSERT_AUDIT = """
+    INSERT INTO sar_audit_trail
+    (case_id, event_type, user_id, input_data, retrieved_context,
+     llm_reasoning, generated_output, human_edits, model_version,
+     confidence_score, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Explicit columns so a schema change does not silently widen every fetch
+_SQL_GET_TRAIL = """
+    SELECT id, case_id, timestamp, event_type, user_id, input_data,
+           retrieved_context, llm_reasoning, generated_output, human_edits,
+           model_version, confidence_score, metadata
+    FROM sar_audit_trail WHERE case_id = ? ORDER BY id ASC
+"""
+
+_SQL_SAVE_CASE = """
+    INSERT INTO sar_cases (case_id, narrative_text, confidence_score, typology, assigned_analyst)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(case_id) DO UPDATE SET
+        narrative_text = excluded.narrative_text,
+        confidence_score = excluded.confidence_score,
+        typology = excluded.typology,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_SQL_APPROVE_CASE = """
+    UPDATE sar_cases SET status = ?, approved_by = ?,
+    approved_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+    WHERE case_id = ?
+"""
+
+_SQL_SET_CASE_STATUS = """
+    UPDATE sar_cases SET status = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE case_id = ?
+"""
+
+# Tables and indexes created by DatabaseManager._create_tables
+_SCHEMA_OBJECTS = (
+    "sar_audit_trail", "sar_cases",
+    "idx_audit_case_id", "idx_audit_event_type", "idx_audit_timestamp",
+)
+
+_SQL_COUNT_SCHEMA = "SELECT COUNT(*) FROM sqlite_master WHERE name IN (%s)" % (
+    ", ".join("?" * len(_SCHEMA_OBJECTS))
+)
+
+_JSON_FIELDS = ("input_data", "retrieved_context", "human_edits", "metadata")
+
+
+def _decode_event(row):
+    """Turn an audit-trail row into a plain dict with its JSON columns parsed."""
+    event = dict(row)
+    for field in _JSON_FIELDS:
+        value = event[field]
+        if value:
+            try:
+                event[field] = json_utils.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                pass
+    return event
+
 
 class DatabaseManager:
     """SQLite-based database manager for audit trail and case storage."""
 
-    def __init__(self):
+    # Shared-cache in-memory database: every connection (and every testing
+    # manager) sees the same data while at least one connection is open.
+    _TESTING_URI = "file:sar_engine_test?mode=memory&cache=shared"
+
+    def __init__(self, testing=False):
         db_config = CONFIG.get("database", {})
-        self.db_path = db_config.get("sqlite_path", "./data/sar_engine.db")
+        self.testing = testing
+        if testing:
+            self.db_path = self._TESTING_URI
+        else:
+            self.db_path = db_config.get("sqlite_path", "./data/sar_engine.db")
+        # One connection shared by all threads (Streamlit reruns each run
+        # on a new thread, so per-thread connections would start cold every
+        # time). Writes and close() are serialized by _write_lock; WAL lets
+        # reads proceed alongside them.
         self.conn = None
+        self._write_lock = threading.Lock()
+
+    def _open(self):
+        """Open and configure the shared connection."""
+        # Autocommit: each single-statement write is its own transaction,
+        # without the module's implicit BEGIN/COMMIT round-trips. Multi-row
+        # writes open an explicit transaction (see log_audit_events).
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, uri=self.testing,
+            isolation_level=None,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        return conn
 
     def connect(self):
         """Connect to SQLite database and create tables if needed."""
         try:
-            db_dir = Path(self.db_path).parent
-            db_dir.mkdir(parents=True, exist_ok=True)
+            if not self.testing:
+                db_dir = Path(self.db_path).parent
+                db_dir.mkdir(parents=True, exist_ok=True)
 
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
-            self.conn.execute("PRAGMA journal_mode=WAL")
-            self._create_tables()
+            if self.conn is None:
+                self.conn = self._open()
+            if not self._schema_exists():
+                self._create_tables()
             logger.info("SQLite database connected: %s", self.db_path)
         except Exception as e:
             logger.warning("Database connection failed: %s. Using in-memory fallback.", e)
-            self.conn = None
+            self.close()
+
+    def _schema_exists(self):
+        """Whether every table and index from _create_tables is present.
+
+        Asks the database itself, so a deleted or recreated file (or the
+        in-memory testing database) still gets its schema.
+        """
+        row = self.conn.execute(_SQL_COUNT_SCHEMA, _SCHEMA_OBJECTS).fetchone()
+        return row[0] == len(_SCHEMA_OBJECTS)
 
     def _create_tables(self):
         """Create tables if they do not exist."""
@@ -64,11 +174,31 @@ class DatabaseManager:
                 updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
             );
 
+            -- SQLite appends the rowid (id) to every index, so this index
+            -- also serves "WHERE case_id = ? ORDER BY id" without a sort.
             CREATE INDEX IF NOT EXISTS idx_audit_case_id ON sar_audit_trail(case_id);
             CREATE INDEX IF NOT EXISTS idx_audit_event_type ON sar_audit_trail(event_type);
             CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON sar_audit_trail(timestamp);
         """)
-        self.conn.commit()
+
+    @staticmethod
+    def _audit_row(
+        case_id, event_type, user_id="system",
+        input_data=None, retrieved_context=None,
+        llm_reasoning=None, generated_output=None,
+        human_edits=None, model_version=None,
+        confidence_score=None, metadata=None
+    ):
+        """Build the parameter tuple for one sar_audit_trail insert."""
+        return (
+            case_id, event_type, user_id,
+            json_utils.dumps(input_data) if input_data else None,
+            json_utils.dumps(retrieved_context) if retrieved_context else None,
+            llm_reasoning, generated_output,
+            json_utils.dumps(human_edits) if human_edits else None,
+            model_version, confidence_score,
+            json_utils.dumps(metadata) if metadata else None,
+        )
 
     def log_audit_event(
         self, case_id, event_type, user_id="system",
@@ -78,56 +208,62 @@ class DatabaseManager:
         confidence_score=None, metadata=None
     ):
         """Log an audit event to the database."""
-        if self.conn is None:
-            logger.warning("No DB connection. Audit event logged to console only.")
-            logger.info("AUDIT: %s | %s | %s", case_id, event_type, user_id)
-            return
-
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO sar_audit_trail
-                (case_id, event_type, user_id, input_data, retrieved_context,
-                 llm_reasoning, generated_output, human_edits, model_version,
-                 confidence_score, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            conn = self.conn
+            if conn is None:
+                logger.warning("No DB connection. Audit event logged to console only.")
+                logger.info("AUDIT: %s | %s | %s", case_id, event_type, user_id)
+                return
+
+            row = self._audit_row(
                 case_id, event_type, user_id,
-                json.dumps(input_data) if input_data else None,
-                json.dumps(retrieved_context) if retrieved_context else None,
+                input_data, retrieved_context,
                 llm_reasoning, generated_output,
-                json.dumps(human_edits) if human_edits else None,
-                model_version, confidence_score,
-                json.dumps(metadata) if metadata else None,
-            ))
-            self.conn.commit()
+                human_edits, model_version,
+                confidence_score, metadata,
+            )
+            with self._write_lock:
+                conn.execute(_SQL_INSERT_AUDIT, row)
             logger.info("Audit event logged: %s - %s", case_id, event_type)
         except Exception as e:
             logger.error("Failed to log audit event: %s", e)
 
+    def log_audit_events(self, events):
+        """Log several audit events in a single transaction.
+
+        Each event is a dict of log_audit_event keyword arguments.
+        """
+        try:
+            conn = self.conn
+            if conn is None:
+                logger.warning("No DB connection. Audit events logged to console only.")
+                for event in events:
+                    logger.info("AUDIT: %s | %s | %s", event.get("case_id"),
+                                event.get("event_type"), event.get("user_id", "system"))
+                return
+
+            rows = [self._audit_row(**event) for event in events]
+            with self._write_lock:
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(_SQL_INSERT_AUDIT, rows)
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            logger.info("Audit events logged: %d", len(rows))
+        except Exception as e:
+            logger.error("Failed to log audit events: %s", e)
+
     def get_audit_trail(self, case_id):
         """Retrieve audit trail for a case."""
-        if self.conn is None:
-            return []
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "SELECT * FROM sar_audit_trail WHERE case_id = ? ORDER BY timestamp ASC",
-                (case_id,),
-            )
-            rows = cursor.fetchall()
-            result = []
-            for row in rows:
-                event = dict(row)
-                # Parse JSON fields back to dicts
-                for field in ["input_data", "retrieved_context", "human_edits", "metadata"]:
-                    if event.get(field):
-                        try:
-                            event[field] = json.loads(event[field])
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                result.append(event)
-            return result
+            conn = self.conn
+            if conn is None:
+                return []
+            cursor = conn.cursor()
+            cursor.execute(_SQL_GET_TRAIL, (case_id,))
+            return [_decode_event(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error("Failed to get audit trail: %s", e)
             return []
@@ -135,45 +271,36 @@ class DatabaseManager:
     def save_case(self, case_id, narrative_text, confidence_score,
                   typology, analyst="system"):
         """Save or update a case record."""
-        if self.conn is None:
-            return
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO sar_cases (case_id, narrative_text, confidence_score, typology, assigned_analyst)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(case_id) DO UPDATE SET
-                    narrative_text = excluded.narrative_text,
-                    confidence_score = excluded.confidence_score,
-                    typology = excluded.typology,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (case_id, narrative_text, confidence_score, typology, analyst))
-            self.conn.commit()
+            conn = self.conn
+            if conn is None:
+                return
+            with self._write_lock:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_SAVE_CASE, (
+                    case_id, narrative_text, confidence_score, typology, analyst,
+                ))
         except Exception as e:
             logger.error("Failed to save case: %s", e)
 
     def update_case_status(self, case_id, status, approved_by=None):
         """Update the status of a case."""
-        if self.conn is None:
-            return
         try:
-            cursor = self.conn.cursor()
-            if status == "approved":
-                cursor.execute("""
-                    UPDATE sar_cases SET status = ?, approved_by = ?,
-                    approved_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
-                    WHERE case_id = ?
-                """, (status, approved_by, case_id))
-            else:
-                cursor.execute("""
-                    UPDATE sar_cases SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE case_id = ?
-                """, (status, case_id))
-            self.conn.commit()
+            conn = self.conn
+            if conn is None:
+                return
+            with self._write_lock:
+                cursor = conn.cursor()
+                if status == "approved":
+                    cursor.execute(_SQL_APPROVE_CASE, (status, approved_by, case_id))
+                else:
+                    cursor.execute(_SQL_SET_CASE_STATUS, (status, case_id))
         except Exception as e:
             logger.error("Failed to update case status: %s", e)
 
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close the shared database connection."""
+        with self._write_lock:
+            conn, self.conn = self.conn, None
+            if conn is not None:
+                conn.close()
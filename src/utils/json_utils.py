@@ -0,0 +1,41 @@
+"""JSON helpers backed by orjson, falling back to the stdlib json module.
+
+orjson is several times faster than json for the small payloads we
+serialize on hot paths (JWT claims, audit-trail fields). It is optional:
+when it is not installed the stdlib implementation is used instead.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def dumps_bytes(obj, default=None, pretty=False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, compact unless pretty (2-space indent)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    if pretty:
+        return json.dumps(obj, default=default, indent=2).encode("utf-8")
+    return json.dumps(obj, default=default, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj, default=None, pretty=False) -> str:
+    """Serialize obj to a JSON string, compact unless pretty (2-space indent)."""
+    return dumps_bytes(obj, default=default, pretty=pretty).decode("utf-8")
+
+
+def loads(data):
+    """Deserialize JSON from str or bytes.
+
+    Raises json.JSONDecodeError on malformed input (orjson's error type
+    subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
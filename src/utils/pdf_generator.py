@@ -6,6 +6,28 @@ from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
 
+# Styles are immutable once built, so construct them once at import time
+# rather than on every report.
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    "SARTitle", parent=_STYLES["Title"],
+    fontSize=16, spaceAfter=20,
+)
+_HEADING_STYLE = ParagraphStyle(
+    "SARHeading", parent=_STYLES["Heading2"],
+    fontSize=12, textColor=colors.HexColor("#1a237e"), spaceAfter=10,
+)
+_BODY_STYLE = ParagraphStyle(
+    "SARBody", parent=_STYLES["BodyText"],
+    fontSize=10, leading=14, spaceAfter=8,
+)
+_META_STYLE = ParagraphStyle(
+    "SARMeta", parent=_STYLES["BodyText"],
+    fontSize=8, textColor=colors.grey, spaceAfter=4,
+)
+
+_SECTION_PREFIXES = ("I.", "II.", "III.", "IV.", "V.")
+
 
 def generate_pdf(narrative, case_id: str) -> bytes:
     """Generate a PDF report from a SAR narrative."""
@@ -16,33 +38,15 @@ def generate_pdf(narrative, case_id: str) -> bytes:
         leftMargin=2.5 * cm, rightMargin=2.5 * cm,
     )
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "SARTitle", parent=styles["Title"],
-        fontSize=16, spaceAfter=20,
-    )
-    heading_style = ParagraphStyle(
-        "SARHeading", parent=styles["Heading2"],
-        fontSize=12, textColor=colors.HexColor("#1a237e"), spaceAfter=10,
-    )
-    body_style = ParagraphStyle(
-        "SARBody", parent=styles["BodyText"],
-        fontSize=10, leading=14, spaceAfter=8,
-    )
-    meta_style = ParagraphStyle(
-        "SARMeta", parent=styles["BodyText"],
-        fontSize=8, textColor=colors.grey, spaceAfter=4,
-    )
-
     story = []
 
     # Header
-    story.append(Paragraph("SUSPICIOUS TRANSACTION REPORT", title_style))
-    story.append(Paragraph("Case ID: %s" % case_id, meta_style))
+    story.append(Paragraph("SUSPICIOUS TRANSACTION REPORT", _TITLE_STYLE))
+    story.append(Paragraph("Case ID: %s" % case_id, _META_STYLE))
     story.append(Paragraph(
-        "Generated: %s" % datetime.now().strftime("%Y-%m-%d %H:%M:%S"), meta_style
+        "Generated: %s" % datetime.now().strftime("%Y-%m-%d %H:%M:%S"), _META_STYLE
     ))
-    story.append(Paragraph("Classification: CONFIDENTIAL", meta_style))
+    story.append(Paragraph("Classification: CONFIDENTIAL", _META_STYLE))
     story.append(Spacer(1, 20))
 
     # Narrative text
@@ -55,20 +59,20 @@ def generate_pdf(narrative, case_id: str) -> bytes:
         line = line.strip()
         if not line:
             story.append(Spacer(1, 6))
-        elif any(line.startswith(prefix) for prefix in ("I.", "II.", "III.", "IV.", "V.")):
-            story.append(Paragraph(line, heading_style))
+        elif line.startswith(_SECTION_PREFIXES):
+            story.append(Paragraph(line, _HEADING_STYLE))
         else:
             line = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            story.append(Paragraph(line, body_style))
+            story.append(Paragraph(line, _BODY_STYLE))
 
     # Footer
     story.append(Spacer(1, 30))
-    story.append(Paragraph("--- END OF REPORT ---", meta_style))
+    story.append(Paragraph("--- END OF REPORT ---", _META_STYLE))
     story.append(Paragraph(
-        "This report was generated by AuditWatch SAR Narrative Generator.", meta_style
+        "This report was generated by AuditWatch SAR Narrative Generator.", _META_STYLE
     ))
     story.append(Paragraph(
-        "All data points are traceable via the audit trail.", meta_style
+        "All data points are traceable via the audit trail.", _META_STYLE
     ))
 
     doc.build(story)
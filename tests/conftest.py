@@ -0,0 +1,80 @@
+"""Shared pytest fixtures.
+
+Construction of the auth manager, database, MCP servers and agents (config
+load, user seeding, SQLite connect) costs more than most assertions, so
+each is built once per session -- i.e. once per xdist worker.
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+from src.utils import json_utils
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _repo_root_cwd():
+    """Run from the project root so relative data/config paths resolve."""
+    previous = os.getcwd()
+    os.chdir(ROOT)
+    yield
+    os.chdir(previous)
+
+
+@pytest.fixture(scope="session")
+def load_case():
+    """Return a loader that parses each sample case once per session.
+
+    The returned dicts are shared; deepcopy one before mutating it.
+    """
+    @lru_cache(maxsize=None)
+    def _load(path):
+        return json_utils.loads((ROOT / path).read_bytes())
+    return _load
+
+
+@pytest.fixture(scope="session")
+def case_model(load_case):
+    """Return a loader that validates each sample case into a CaseInput once."""
+    from src.models.case_input import CaseInput
+
+    @lru_cache(maxsize=None)
+    def _model(path):
+        return CaseInput(**load_case(path))
+    return _model
+
+
+@pytest.fixture(scope="session")
+def auth_manager():
+    from src.utils.auth import AuthManager
+    return AuthManager()
+
+
+@pytest.fixture(scope="session")
+def db():
+    from src.utils.db_utils import DatabaseManager
+    manager = DatabaseManager(testing=True)
+    manager.connect()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture(scope="session")
+def audit_logger():
+    from src.components.audit_logger import AuditLogger
+    return AuditLogger()
+
+
+@pytest.fixture(scope="session")
+def analyzer():
+    from src.agents.mcp_servers import TransactionAnalyzerServer
+    return TransactionAnalyzerServer()
+
+
+@pytest.fixture(scope="session")
+def coord():
+    from src.agents.a2a_agents import CoordinatorAgent
+    return CoordinatorAgent()